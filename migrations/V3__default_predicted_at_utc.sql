@@ -0,0 +1,7 @@
+-- Let the database stamp predictions in UTC
+-- The pipeline no longer sends predicted_at. clock_timestamp() is evaluated per row, like the former
+-- client-side datetime.utcnow(); now() would give every row of a run its transaction start time
+ALTER TABLE predictions
+ALTER COLUMN predicted_at SET DEFAULT (clock_timestamp() AT TIME ZONE 'utc');
+
+COMMENT ON COLUMN predictions.predicted_at IS 'UTC time the prediction was written (server default)';
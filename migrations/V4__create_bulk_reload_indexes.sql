@@ -0,0 +1,10 @@
+-- Record secondary indexes dropped for BULK_RELOAD runs until they are rebuilt
+-- Rows are written in the same transaction as the DROP INDEX and deleted once the index exists again,
+-- so a run killed between the two leaves its definitions here for the next reload to replay.
+CREATE TABLE IF NOT EXISTS bulk_reload_indexes (
+    name VARCHAR(255) PRIMARY KEY,
+    definition TEXT NOT NULL,
+    dropped_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+COMMENT ON TABLE bulk_reload_indexes IS 'CREATE INDEX statements of indexes dropped by a BULK_RELOAD run and not yet rebuilt';
@@ -9,44 +9,35 @@ This DAG orchestrates the batch processing of transaction data:
 Schedule: Daily at 2 AM UTC
 """
 
+from __future__ import annotations
+
 import logging
 from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
 
 from airflow import DAG
-from airflow.providers.docker.operators.docker import DockerOperator
 from airflow.providers.standard.operators.python import PythonOperator
+from airflow.sdk import Variable, task
 from airflow.sdk.bases.hook import BaseHook
+from dynamic_docker_operator import DynamicDockerOperator
 
 logger = logging.getLogger(__name__)
 
 
-class DynamicDockerOperator(DockerOperator):
-    """Custom DockerOperator that pulls environment variables from XCom."""
-
-    def __init__(self, xcom_task_id: str, xcom_key: str = "return_value", **kwargs):
-        """
-        Initialize with XCom task ID to pull environment from.
+def with_connection_params(database_url: str, **params: str) -> str:
+    """
+    Merge libpq connection parameters into a database URL.
 
-        Args:
-            xcom_task_id: Task ID to pull XCom value from
-            xcom_key: XCom key to use (default: 'return_value')
-        """
-        self.xcom_task_id = xcom_task_id
-        self.xcom_key = xcom_key
-        super().__init__(**kwargs)
+    Args:
+        database_url: PostgreSQL connection URL
+        **params: Query parameters to add (existing ones take precedence)
 
-    def execute(self, context):
-        """Pull environment from XCom before executing."""
-        # Pull environment variables from XCom
-        ti = context.get("ti")
-        if ti:
-            env_vars = ti.xcom_pull(task_ids=self.xcom_task_id, key=self.xcom_key)
-            # Update the environment parameter
-            if env_vars:
-                self.environment = env_vars
-
-        # Call parent execute
-        return super().execute(context)
+    Returns:
+        URL with the parameters in its query string
+    """
+    parts = urlsplit(database_url)
+    query = {**params, **dict(parse_qsl(parts.query))}
+    return urlunsplit(parts._replace(query=urlencode(query, quote_via=quote)))
 
 
 # Default arguments for the DAG
@@ -72,10 +63,12 @@ with DAG(
 ) as dag:
     # Batch processing configuration (adjust as needed)
     BATCH_CONFIG = {
-        "ROW_BATCH_SIZE": "5000",  # Number of rows to process at once from CSV
+        "ROW_BATCH_SIZE": "50000",  # Number of rows to process at once from CSV
         "API_BATCH_SIZE": "100",  # Number of records per ML API request
-        "API_MAX_WORKERS": "5",  # Concurrent API request workers
-        "DB_ROW_BATCH_SIZE": "1000",  # Number of rows per database insert
+        "API_MAX_WORKERS": "32",  # Concurrent API request workers per container
+        "DB_ROW_BATCH_SIZE": "10000",  # Number of rows per database write (COPY above COPY_ROW_THRESHOLD)
+        "SKIP_ML": "false",  # Set to "true" to load without scoring (re-loading a file duplicates its rows)
+        "BULK_RELOAD": "false",  # Set to "true" for full reloads: drop/rebuild secondary indexes around the load
     }
 
     # Get connections and secrets securely
@@ -92,6 +85,11 @@ with DAG(
         if database_url.startswith("postgres://"):
             database_url = database_url.replace("postgres://", "postgresql://", 1)
 
+        # Append-only writes: skip fsync wait on commit, tag connections with the run for pg_stat_activity
+        database_url = with_connection_params(
+            database_url, application_name=f"batch_{run_id}", options="-c synchronous_commit=off"
+        )
+
         # Get MinIO/S3 connection
         minio_conn = BaseHook.get_connection("minio_s3")
         endpoint_url = f"http://{minio_conn.host}:{minio_conn.port}"
@@ -113,25 +111,34 @@ with DAG(
         }
         env_vars.update(BATCH_CONFIG)
 
-        # Store in XCom for next task
+        # Handed straight to the container, not stored in XCom
         return env_vars
 
-    get_env_task = PythonOperator(
-        task_id="get_environment_vars",
-        python_callable=get_environment_vars,
-    )
-
-    # Task: Run batch processing using custom DockerOperator
-    run_batch_processing = DynamicDockerOperator(
+    # Task: List the source files to process in this run
+    @task
+    def list_pending_batches() -> list[dict]:
+        """Return one container environment per S3 file listed in the batch_s3_paths Variable."""
+        s3_paths = Variable.get(
+            "batch_s3_paths", default=["s3://transactions/transactions_fr.csv"], deserialize_json=True
+        )
+        logger.info(f"Fanning out {len(s3_paths)} batch file(s)")
+        return [{"S3_PATH": s3_path} for s3_path in s3_paths]
+
+    # Task: Run batch processing using custom DockerOperator, one mapped instance per file
+    # Connections are resolved inside this task, saving a task and an XCom write per run
+    # ml_api_pool bounds how many containers hit the ML API at once; cheap tasks stay unpooled
+    run_batch_processing = DynamicDockerOperator.partial(
         task_id="run_batch_processing",
+        pool="ml_api_pool",
         image="batch-processor:latest",
         api_version="auto",
         auto_remove="success",
         network_mode="dataeng-q3-2025_ml-network",
         docker_url="unix://var/run/docker.sock",
         mount_tmp_dir=False,
-        xcom_task_id="get_environment_vars",
-    )
+        mem_limit="1g",  # Bound each run so overlapping schedules cannot starve the host
+        environment_callable=get_environment_vars,
+    ).expand(environment=list_pending_batches())
 
     # Task: Log completion
     def log_completion(**context):
@@ -149,4 +156,4 @@ with DAG(
     )
 
     # Define task dependencies
-    get_env_task >> run_batch_processing >> log_completion_task  # type: ignore[expression-value]
+    run_batch_processing >> log_completion_task  # type: ignore[expression-value]
@@ -0,0 +1,32 @@
+"""Custom Docker operator for the batch transaction pipeline.
+
+Lives in the Airflow plugins folder (on sys.path for DAG files) so the
+scheduler imports it once instead of re-parsing it with every DAG file.
+"""
+
+from collections.abc import Callable
+
+from airflow.providers.docker.operators.docker import DockerOperator
+
+
+class DynamicDockerOperator(DockerOperator):
+    """Custom DockerOperator that resolves its environment at execution time."""
+
+    def __init__(self, environment_callable: Callable[..., dict], **kwargs):
+        """
+        Initialize with a callable that builds the container environment.
+
+        Args:
+            environment_callable: Called with the task context right before the
+                container starts; returns the environment variables to pass
+        """
+        self.environment_callable = environment_callable
+        super().__init__(**kwargs)
+
+    def execute(self, context):
+        """Resolve environment in-process before executing."""
+        # Secrets stay in worker memory: passed as private_environment, never written to XCom
+        self.private_environment = {**(self.private_environment or {}), **self.environment_callable(**context)}
+
+        # Call parent execute
+        return super().execute(context)
@@ -11,8 +11,14 @@ from collections.abc import Iterator
 from datetime import datetime
 
 from core import orchestrate_service
-from infrastructure import BaseService, get_db_session
-from infrastructure.generator import load_and_validate_transactions
+from infrastructure import (
+    BaseService,
+    db_create_secondary_indexes,
+    db_drop_secondary_indexes,
+    get_db_session,
+    with_connection_params,
+)
+from infrastructure.generator import load_and_validate_transactions, s3_storage_options
 from sqlalchemy.orm import Session
 
 # Configure logging
@@ -50,7 +56,15 @@ class BatchService(BaseService):
     for CSV parsing and validation logic reuse.
     """
 
-    def __init__(self, s3_path: str, storage_options: dict, ml_api_url: str, db_session: Session, run_id: str) -> None:
+    def __init__(
+        self,
+        s3_path: str,
+        storage_options: dict,
+        ml_api_url: str,
+        db_session: Session,
+        run_id: str,
+        api_max_workers: int = 10,
+    ) -> None:
         """
         Initialize BatchService with S3 and database configuration.
 
@@ -59,21 +73,23 @@ class BatchService(BaseService):
         s3_path : str
             S3/MinIO path to transaction CSV file.
         storage_options : dict
-            S3 configuration dictionary containing:
-            - key: MinIO access key
-            - secret: MinIO secret key
-            - client_kwargs: Dict with endpoint_url
+            Polars object_store options built by s3_storage_options
+            (access key, secret, endpoint URL).
         ml_api_url : str
             ML API endpoint URL for classification predictions.
         db_session : Session
             SQLAlchemy session for database operations.
+        run_id : str
+            Identifier of the processing run, stamped on every transaction.
+        api_max_workers : int, optional
+            Parallel API workers, used to size the HTTP connection pool (default: 10).
 
         Notes
         -----
-        Calls parent BaseService.__init__() with ml_api_url and db_session,
+        Calls parent BaseService.__init__() with ml_api_url, db_session and api_max_workers,
         then stores S3-specific configuration as instance attributes.
         """
-        super().__init__(ml_api_url=ml_api_url, db_session=db_session)
+        super().__init__(ml_api_url=ml_api_url, db_session=db_session, api_max_workers=api_max_workers)
         self.s3_path = s3_path
         self.storage_options = storage_options
         self.run_id = run_id
@@ -117,6 +133,53 @@ class BatchService(BaseService):
         )
 
 
+def load_without_predictions(service: BatchService, row_batch_size: int) -> tuple[int, list[dict]]:
+    """
+    Load validated transactions straight into the database, skipping ML scoring.
+
+    Used to land raw transactions when scoring is not wanted (e.g., the ML
+    API is down, or they will be scored later from unprocessed_transactions).
+
+    Parameters
+    ----------
+    service : BatchService
+        Service providing read() and bulk_write().
+    row_batch_size : int
+        Number of transactions to load per batch from source.
+
+    Returns
+    -------
+    tuple[int, list[dict]]
+        Tuple containing:
+        - Total number of transactions written
+        - List of invalid transactions (validation failures)
+
+    Notes
+    -----
+    Each batch is written on its own, so batches at or above
+    COPY_ROW_THRESHOLD go through COPY.
+    Every loaded row gets a fresh UUID, so this never matches rows from an
+    earlier run: reloading a file that was already loaded inserts a second,
+    unscored copy of each transaction.
+    """
+    total_written = 0
+    all_invalid_transactions = []
+
+    for batch_id, (valid_transactions, invalid_transactions) in enumerate(service.read(row_batch_size)):
+        if invalid_transactions:
+            all_invalid_transactions.extend(invalid_transactions)
+            logger.error(f"Batch {batch_id}: Found {len(invalid_transactions)} invalid transactions during validation")
+
+        total_written += len(valid_transactions)
+        service.bulk_write(valid_transactions, [])
+
+    logger.info(f"Batch pipeline completed without ML scoring - {total_written} transactions written")
+    if all_invalid_transactions:
+        logger.error(f"INVALID: {len(all_invalid_transactions)} transactions failed validation")
+
+    return total_written, all_invalid_transactions
+
+
 def main():
     """
     Execute batch processing pipeline.
@@ -125,22 +188,36 @@ def main():
     - Loads configuration from environment variables
     - Creates database session
     - Initializes BatchService with S3/MinIO credentials
-    - Runs orchestrate_service for parallel processing
+    - Runs orchestrate_service for parallel processing, or loads
+      transactions without predictions when SKIP_ML is set
 
     Environment Variables
     ---------------------
     ML_API_URL : str
         ML API endpoint (default: 'http://localhost:8000').
     ROW_BATCH_SIZE : int
-        Transactions per batch from source (default: 5000).
+        Transactions per batch from source (default: 50000).
     API_BATCH_SIZE : int
         Transactions per API request (default: 100).
     API_MAX_WORKERS : int
-        Parallel API workers (default: 5).
+        Parallel API workers (default: 32).
     DB_ROW_BATCH_SIZE : int
-        Threshold for bulk database writes (default: 1000).
+        Threshold for bulk database writes (default: 10000).
+    S3_PATH : str
+        Source CSV (default: 's3://transactions/transactions_fr.csv').
+    SKIP_ML : bool
+        Load transactions without calling the ML API (default: false).
+        Rows get fresh ids, so re-running an already loaded file duplicates it.
+    BULK_RELOAD : bool
+        Drop secondary indexes in a short transaction before loading and
+        rebuild them concurrently once the load has committed
+        (default: false). Indexes lost by a reload that was killed
+        before its rebuild are restored by the next one.
     DATABASE_URL : str
         PostgreSQL connection string (required).
+    STAGING_TABLE : str
+        Per-connection TEMP table COPY loads go through for an idempotent
+        merge (default: empty, COPY straight into transactions).
     KEY : str
         MinIO access key (required).
     SECRET : str
@@ -152,6 +229,8 @@ def main():
     -----
     Generates unique pipeline_run_id for tracking execution.
     Logs configuration and progress throughout execution.
+    Adds application_name and synchronous_commit=off to DATABASE_URL
+    unless already present (the Airflow DAG sets them upstream).
     """
     logger.info("Starting batch pipeline")
 
@@ -160,34 +239,61 @@ def main():
     logger.info(f"Pipeline Run ID: {pipeline_run_id}")
 
     ml_api_url = os.getenv("ML_API_URL", "http://localhost:8000")
-    row_batch_size = int(os.getenv("ROW_BATCH_SIZE", "5000"))
+    row_batch_size = int(os.getenv("ROW_BATCH_SIZE", "50000"))
     api_batch_size = int(os.getenv("API_BATCH_SIZE", "100"))
-    api_max_workers = int(os.getenv("API_MAX_WORKERS", "5"))
-    db_row_batch_size = int(os.getenv("DB_ROW_BATCH_SIZE", "1000"))
+    api_max_workers = int(os.getenv("API_MAX_WORKERS", "32"))
+    db_row_batch_size = int(os.getenv("DB_ROW_BATCH_SIZE", "10000"))
     run_id = os.getenv("BATCH_RUN_ID", "batch_unknown")
+    skip_ml = os.getenv("SKIP_ML", "false").lower() in ("1", "true", "yes")
+    bulk_reload = os.getenv("BULK_RELOAD", "false").lower() in ("1", "true", "yes")
 
     # Read and validate CSV from MinIO
-    s3_path = "s3://transactions/transactions_fr.csv"
-    storage_options = {
-        "key": os.environ["KEY"],
-        "secret": os.environ["SECRET"],
-        "client_kwargs": {"endpoint_url": os.environ["ENDPOINT_URL"]},
-    }
-
-    with get_db_session(os.environ["DATABASE_URL"]) as session:
-        orchestrate_service(
-            service=BatchService(
+    s3_path = os.getenv("S3_PATH", "s3://transactions/transactions_fr.csv")
+    storage_options = s3_storage_options(
+        key=os.environ["KEY"], secret=os.environ["SECRET"], endpoint_url=os.environ["ENDPOINT_URL"]
+    )
+
+    # Append-only output: trade fsync-per-commit for throughput, tag connections for pg_stat_activity
+    database_url = with_connection_params(
+        os.environ["DATABASE_URL"], application_name=f"batch_{run_id}", options="-c synchronous_commit=off"
+    )
+
+    if bulk_reload:
+        # Own short transaction: DROP INDEX locks out readers too, so release it before the load starts
+        with get_db_session(database_url) as session:
+            db_drop_secondary_indexes(session)
+
+    try:
+        with get_db_session(database_url, bulk_mode=True) as session:
+            service = BatchService(
                 s3_path=s3_path,
                 storage_options=storage_options,
                 ml_api_url=ml_api_url,
                 db_session=session,
                 run_id=run_id,
-            ),
-            row_batch_size=row_batch_size,
-            api_batch_size=api_batch_size,
-            api_max_workers=api_max_workers,
-            db_row_batch_size=db_row_batch_size,
-        )
+                api_max_workers=api_max_workers,
+            )
+
+            if skip_ml:
+                logger.warning(
+                    "SKIP_ML set - loading transactions without ML scoring; rows get new ids, "
+                    "so a file that was already loaded will be duplicated"
+                )
+                load_without_predictions(service=service, row_batch_size=row_batch_size)
+            else:
+                orchestrate_service(
+                    service=service,
+                    row_batch_size=row_batch_size,
+                    api_batch_size=api_batch_size,
+                    api_max_workers=api_max_workers,
+                    db_row_batch_size=db_row_batch_size,
+                )
+    finally:
+        if bulk_reload:
+            # Rebuilt after the load has committed (or rolled back), concurrently with other sessions;
+            # also replays definitions left in bulk_reload_indexes by a reload that was killed before this step
+            with get_db_session(database_url) as session:
+                db_create_secondary_indexes(session)
 
 
 if __name__ == "__main__":
@@ -5,25 +5,37 @@ transaction messages from Kafka topics, processes them (validation,
 ML predictions, database persistence), and handles failures.
 """
 
-import json
 import logging
 import os
+import queue
+import threading
 import time
+from collections import OrderedDict
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
 
+import orjson
 from confluent_kafka import Consumer
 from core import orchestrate_service, validate_transaction_records
 from infrastructure import BaseService, db_transaction, get_db_session
 from sqlalchemy.orm import Session
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Logging is configured in main(), so importing this module leaves the root logger alone
 logger = logging.getLogger(__name__)
 
+# Lower bound for the adaptive consume batch size
+MIN_MESSAGE_BATCH_SIZE = 10
+
+# Fields the ML API classifies on; replayed messages equal on these reuse the cached category
+PREDICTION_KEY_FIELDS = ("description", "amount", "timestamp", "merchant", "operation_type", "side")
+
 
 @contextmanager
-def get_kafka_consumer(bootstrap_servers: str, group_id: str, topic: str):
+def get_kafka_consumer(
+    bootstrap_servers: str, group_id: str, topic: str, fetch_min_bytes: int = 1, fetch_wait_max_ms: int = 500
+):
     """
     Context manager for Kafka Consumer.
 
@@ -35,6 +47,12 @@ def get_kafka_consumer(bootstrap_servers: str, group_id: str, topic: str):
         Consumer group ID for coordinated consumption.
     topic : str
         Kafka topic to subscribe to.
+    fetch_min_bytes : int, optional
+        Minimum bytes the broker accumulates before answering a fetch
+        (default: 1, librdkafka's default).
+    fetch_wait_max_ms : int, optional
+        Maximum time the broker waits to reach fetch_min_bytes
+        (default: 500, librdkafka's default).
 
     Yields
     ------
@@ -46,8 +64,18 @@ def get_kafka_consumer(bootstrap_servers: str, group_id: str, topic: str):
     Consumer automatically closes on context exit.
     Configured with 'auto.offset.reset' set to 'earliest'
     to consume from beginning if no offset exists.
+    Raising fetch_min_bytes makes the broker return fewer, larger fetch
+    responses, cutting socket reads and syscalls per message under load.
     """
-    c = Consumer({"bootstrap.servers": bootstrap_servers, "group.id": group_id, "auto.offset.reset": "earliest"})
+    c = Consumer(
+        {
+            "bootstrap.servers": bootstrap_servers,
+            "group.id": group_id,
+            "auto.offset.reset": "earliest",
+            "fetch.min.bytes": fetch_min_bytes,
+            "fetch.wait.max.ms": fetch_wait_max_ms,
+        }
+    )
 
     c.subscribe([topic])
 
@@ -74,9 +102,18 @@ class StreamingService(BaseService):
     message_batch_size : int
         Target number of messages to accumulate before yielding batch.
     poll_timeout : float
-        Timeout in seconds for individual Kafka poll operations.
+        Timeout in seconds for each Kafka consume() call.
     buffer_timeout : float
         Maximum seconds to wait for full batch before yielding partial batch.
+    downstream_seconds : float
+        Time between the previous batch being yielded and the next read()
+        (prediction, persistence and commit of that batch).
+    consume_batch_size_current : int
+        Batch size used by the latest read() after backpressure scaling.
+    prediction_cache_size : int
+        Maximum entries kept in the LRU cache of recent predictions.
+    prediction_cache_ttl : float
+        Seconds a cached prediction is reused before the ML API is asked again.
     ml_api_url : str
         ML API endpoint URL (inherited from BaseService).
     db_session : Session
@@ -86,6 +123,8 @@ class StreamingService(BaseService):
     -------
     read(batch_size: int) -> Iterator[tuple[list[dict], list[dict]]]
         Poll Kafka for messages and yield validated transaction batches.
+    predict(transactions: list[dict]) -> tuple[list[dict], list[dict]]
+        Get predictions, only calling the ML API for unseen transactions.
 
     Notes
     -----
@@ -94,6 +133,14 @@ class StreamingService(BaseService):
     - Time-based: Yields partial batch after buffer_timeout seconds
     - Consecutive poll: Yields after max_consecutive_timeouts empty polls
     This ensures low-latency processing even with variable message rates.
+    The batch size shrinks linearly (down to MIN_MESSAGE_BATCH_SIZE) as the
+    previous batch's downstream time approaches buffer_timeout, so a slow ML
+    API or database is fed smaller batches instead of building memory spikes.
+    A buffer_timeout of 0 yields whatever has arrived and disables the scaling.
+    Redelivered and retried messages are answered from a bounded LRU cache
+    keyed on PREDICTION_KEY_FIELDS, so the ML API only scores new content.
+    Entries expire after prediction_cache_ttl seconds, so a redeployed model
+    takes over without restarting the consumer.
     """
 
     def __init__(
@@ -104,6 +151,9 @@ class StreamingService(BaseService):
         message_batch_size: int = 100,
         poll_timeout: float = 1.0,
         buffer_timeout: float = 5.0,
+        prediction_cache_size: int = 10000,
+        prediction_cache_ttl: float = 600.0,
+        api_max_workers: int = 10,
     ) -> None:
         """
         Initialize StreamingService with Kafka consumer and configuration.
@@ -122,32 +172,47 @@ class StreamingService(BaseService):
             Kafka poll timeout in seconds (default: 1.0).
         buffer_timeout : float, optional
             Max seconds to wait for full batch before yielding partial (default: 5.0).
+        prediction_cache_size : int, optional
+            Recent predictions kept for duplicate messages, 0 disables (default: 10000).
+        prediction_cache_ttl : float, optional
+            Seconds before a cached prediction expires (default: 600.0).
+        api_max_workers : int, optional
+            Parallel API workers, used to size the HTTP connection pool (default: 10).
 
         Notes
         -----
-        Calls parent BaseService.__init__() with ml_api_url and db_session only.
+        Calls parent BaseService.__init__() with ml_api_url, db_session and api_max_workers.
         Does not pass S3 configuration since streaming reads from Kafka, not S3.
         Consumer should be created via get_kafka_consumer context manager.
         """
-        super().__init__(ml_api_url=ml_api_url, db_session=db_session)
+        super().__init__(ml_api_url=ml_api_url, db_session=db_session, api_max_workers=api_max_workers)
         self.consumer = consumer
         self.message_batch_size = message_batch_size
         self.poll_timeout = poll_timeout
         self.buffer_timeout = buffer_timeout
+        self.downstream_seconds = 0.0
+        self.consume_batch_size_current = message_batch_size
+        self.__last_yield_time: float | None = None
+        self.prediction_cache_size = prediction_cache_size
+        self.prediction_cache_ttl = prediction_cache_ttl
+        # key -> (monotonic expiry time, prediction)
+        self.__prediction_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self.__prediction_cache_lock = threading.Lock()  # predict() runs on the API worker threads
 
     def read(self, batch_size: int) -> Iterator[tuple[list[dict], list[dict]]]:
         """
         Poll Kafka for messages and yield validated transaction batches.
 
         Implements the abstract read() method from BaseService for streaming
-        processing. Polls Kafka until accumulating `batch_size` messages or
+        processing. Consumes Kafka messages in bulk until accumulating `batch_size` messages or
         timeout conditions are met, then deserializes, validates, and yields
         exactly ONE batch before returning control to caller.
 
         Parameters
         ----------
         batch_size : int
-            Target number of messages to accumulate before validating and yielding.
+            Target number of messages to accumulate before validating and yielding,
+            scaled down by downstream backpressure.
 
         Yields
         ------
@@ -168,7 +233,7 @@ class StreamingService(BaseService):
 
         Timeout Strategy:
         - Time-based: Yields partial batch if buffer_timeout seconds elapsed
-        - Consecutive poll: Yields partial batch after 3 empty poll attempts
+        - Consecutive poll: Yields partial batch after 3 empty consume() calls
         - This ensures low-latency processing with variable message rates
 
         Validation:
@@ -184,22 +249,21 @@ class StreamingService(BaseService):
         consecutive_timeouts = 0
         max_consecutive_timeouts = 3  # Yield partial batch after 3 consecutive poll timeouts
         batch_start_time = time.time()
+        if self.__last_yield_time is not None:
+            self.downstream_seconds = batch_start_time - self.__last_yield_time
 
-        while len(raw_records) < batch_size:
-            msg = self.consumer.poll(self.poll_timeout)
+        # Backpressure: shrink the batch as the previous one's downstream time nears buffer_timeout
+        # (a zero timeout already yields as soon as anything arrives, so there is nothing to scale)
+        if self.buffer_timeout > 0:
+            pressure = min(self.downstream_seconds / self.buffer_timeout, 1.0)
+            batch_size = max(MIN_MESSAGE_BATCH_SIZE, int(batch_size * (1.0 - pressure)))
+        self.consume_batch_size_current = batch_size
 
-            # Check time-based timeout (e.g., 5 seconds elapsed)
-            elapsed_time = time.time() - batch_start_time
-            if raw_records and elapsed_time >= self.buffer_timeout:
-                logger.debug(f"Yielding partial batch after {elapsed_time:.1f}s timeout: {len(raw_records)} messages")
-                # Validate accumulated records
-                valid, invalid = validate_transaction_records(raw_records)
-                # Combine validation errors with JSON errors
-                all_invalid = invalid + json_errors
-                yield (valid, all_invalid)
-                return
+        while len(raw_records) < batch_size:
+            # Fetch up to the remaining batch in one librdkafka call instead of one poll() per message
+            msgs = self.consumer.consume(num_messages=batch_size - len(raw_records), timeout=self.poll_timeout)
 
-            if msg is None:
+            if not msgs:
                 consecutive_timeouts += 1
                 # Yield partial batch if we have data and hit consecutive timeout threshold
                 if raw_records and consecutive_timeouts >= max_consecutive_timeouts:
@@ -211,31 +275,53 @@ class StreamingService(BaseService):
                     valid, invalid = validate_transaction_records(raw_records)
                     # Combine validation errors with JSON errors
                     all_invalid = invalid + json_errors
+                    self.__last_yield_time = time.time()
                     yield (valid, all_invalid)
                     return
                 continue
 
-            consecutive_timeouts = 0  # Reset on successful message
-
-            if msg.error():
-                logger.error(f"Consumer error: {msg.error()}")
-                continue
-
-            value = msg.value()
-            if value is None:
-                logger.warning("Received message with None value, skipping")
-                continue
-
-            # Deserialize JSON
-            try:
-                raw_data = json.loads(value.decode("utf-8"))
-                raw_records.append(raw_data)
-            except json.JSONDecodeError as exc:
-                logger.warning(f"Invalid JSON in message: {exc}")
-                json_errors.append({"raw": value.decode("utf-8", errors="replace"), "error": str(exc)})
-            except Exception as exc:
-                logger.error(f"Unexpected error deserializing message: {exc}")
-                json_errors.append({"error": str(exc)})
+            consecutive_timeouts = 0  # Reset on successful consume
+            fetch_json_errors = len(json_errors)
+
+            for msg in msgs:
+                if msg.error():
+                    logger.error(f"Consumer error: {msg.error()}")
+                    continue
+
+                value = msg.value()
+                if value is None:
+                    logger.warning("Received message with None value, skipping")
+                    continue
+
+                # Deserialize JSON straight from bytes (no intermediate str)
+                try:
+                    raw_data = orjson.loads(value)
+                    raw_records.append(raw_data)
+                except orjson.JSONDecodeError as exc:
+                    # Keep the undecoded bytes; only the few logged samples are ever rendered
+                    json_errors.append({"raw_bytes": value, "error": str(exc)})
+                except Exception as exc:
+                    logger.error(f"Unexpected error deserializing message: {exc}")
+                    json_errors.append({"error": str(exc)})
+
+            # One warning per fetch instead of one per malformed message
+            if len(json_errors) > fetch_json_errors:
+                logger.warning(
+                    f"{len(json_errors) - fetch_json_errors} undecodable messages in this fetch; "
+                    f"sample: {json_errors[fetch_json_errors]['error']}"
+                )
+
+            # Check time-based timeout (e.g., 5 seconds elapsed) once the fetched messages are kept
+            elapsed_time = time.time() - batch_start_time
+            if raw_records and len(raw_records) < batch_size and elapsed_time >= self.buffer_timeout:
+                logger.debug(f"Yielding partial batch after {elapsed_time:.1f}s timeout: {len(raw_records)} messages")
+                # Validate accumulated records
+                valid, invalid = validate_transaction_records(raw_records)
+                # Combine validation errors with JSON errors
+                all_invalid = invalid + json_errors
+                self.__last_yield_time = time.time()
+                yield (valid, all_invalid)
+                return
 
         # Validate full batch using core validation
         logger.debug(f"Validating batch: {len(raw_records)} records, {len(json_errors)} JSON errors")
@@ -248,8 +334,83 @@ class StreamingService(BaseService):
             f"Yielding full batch: {len(valid_transactions)} valid, {len(all_invalid)} invalid "
             f"(Pydantic: {len(invalid_transactions)}, JSON: {len(json_errors)})"
         )
+        self.__last_yield_time = time.time()
         yield (valid_transactions, all_invalid)
 
+    def predict(self, transactions: list[dict]) -> tuple[list[dict], list[dict]]:
+        """
+        Get predictions, only sending transactions not seen recently to the ML API.
+
+        Parameters
+        ----------
+        transactions : list[dict]
+            List of validated transaction dictionaries.
+
+        Returns
+        -------
+        tuple[list[dict], list[dict]]
+            Tuple containing:
+            - List of transaction dictionaries
+            - List of prediction dictionaries in the same order,
+              or None if the ML API call failed after retries
+
+        Notes
+        -----
+        Transactions are keyed on PREDICTION_KEY_FIELDS (their fresh UUIDs
+        always differ). Cached predictions and duplicates within the batch
+        are copied with the new transaction_id; only the first occurrence
+        of each unseen or expired key is posted. A response missing one of
+        the posted ids fails the whole slice, as an API error would.
+        """
+        if not self.prediction_cache_size:
+            return super().predict(transactions)
+
+        keys = [tuple(transaction[field] for field in PREDICTION_KEY_FIELDS) for transaction in transactions]
+        now = time.monotonic()
+        known = {}
+        with self.__prediction_cache_lock:
+            for key in keys:
+                entry = self.__prediction_cache.get(key)
+                if entry is None or key in known:
+                    continue
+                if entry[0] <= now:
+                    del self.__prediction_cache[key]
+                    continue
+                known[key] = entry[1]
+                self.__prediction_cache.move_to_end(key)
+
+        unseen = {}
+        for key, transaction in zip(keys, transactions, strict=True):
+            if key not in known and key not in unseen:
+                unseen[key] = transaction
+
+        if unseen:
+            _, predictions = super().predict(list(unseen.values()))
+            if not predictions:
+                return transactions, predictions
+
+            by_id = {prediction["transaction_id"]: prediction for prediction in predictions}
+            missing = sum(transaction["id"] not in by_id for transaction in unseen.values())
+            if missing:
+                logger.warning(f"ML API response lacks {missing}/{len(unseen)} transaction ids; failing the batch")
+                return transactions, None
+
+            fresh = {key: by_id[transaction["id"]] for key, transaction in unseen.items()}
+            known.update(fresh)
+            expires_at = now + self.prediction_cache_ttl
+            with self.__prediction_cache_lock:
+                self.__prediction_cache.update((key, (expires_at, prediction)) for key, prediction in fresh.items())
+                while len(self.__prediction_cache) > self.prediction_cache_size:
+                    self.__prediction_cache.popitem(last=False)
+
+        if len(unseen) < len(transactions):
+            logger.debug(f"Prediction cache: {len(transactions) - len(unseen)}/{len(transactions)} hits")
+
+        return transactions, [
+            {**known[key], "transaction_id": transaction["id"]}
+            for key, transaction in zip(keys, transactions, strict=True)
+        ]
+
 
 def main():
     """
@@ -270,6 +431,10 @@ def main():
         Consumer group ID (default: 'transaction-consumer-group').
     KAFKA_TOPIC : str
         Source Kafka topic (default: 'transactions').
+    KAFKA_FETCH_MIN_BYTES : int
+        Minimum bytes per broker fetch response (default: 65536).
+    KAFKA_FETCH_WAIT_MAX_MS : int
+        Max broker wait to fill KAFKA_FETCH_MIN_BYTES (default: 100).
     ML_API_URL : str
         ML API endpoint (default: 'http://localhost:8000').
     MESSAGE_BATCH_SIZE : int
@@ -282,81 +447,114 @@ def main():
         Threshold for bulk database writes (default: 1000).
     BUFFER_TIMEOUT : float
         Max seconds to wait for full batch before yielding partial (default: 5.0).
+    PREDICTION_CACHE_SIZE : int
+        Recent predictions reused for duplicate messages, 0 disables (default: 10000).
+    PREDICTION_CACHE_TTL : float
+        Seconds a cached prediction is reused (default: 600).
     DATABASE_URL : str
         PostgreSQL connection string (required).
 
     Notes
     -----
     Runs in infinite loop, processing batches continuously.
+    A single API worker pool and a single database writer thread are
+    shared by every batch window.
     Each iteration calls orchestrate_service which handles validation,
     prediction, and persistence for one batch window.
     Gracefully handles KeyboardInterrupt for clean shutdown.
+    Log records are written by a QueueListener thread so worker threads
+    never block on stderr; the listener is stopped last, once the Kafka
+    consumer and database session have been closed.
     """
-    # Configuration
-    bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
-    group_id = os.getenv("KAFKA_CONSUMER_GROUP", "transaction-consumer-group")
-    topic = os.getenv("KAFKA_TOPIC", "transactions")
-    ml_api_url = os.getenv("ML_API_URL", "http://localhost:8000")
-
-    message_batch_size = int(os.getenv("MESSAGE_BATCH_SIZE", "50"))
-    api_batch_size = int(os.getenv("API_BATCH_SIZE", "10"))
-    api_max_workers = int(os.getenv("API_MAX_WORKERS", "5"))
-    db_row_batch_size = int(os.getenv("DB_ROW_BATCH_SIZE", "50"))
-    buffer_timeout = float(os.getenv("BUFFER_TIMEOUT", "5.0"))
-
-    logger.info(f"Consumer started - Server: {bootstrap_servers}, Group: {group_id}, Topic: {topic}")
-    logger.info(
-        f"Batch config - Messages: {message_batch_size}, API: {api_batch_size}, "
-        f"DB: {db_row_batch_size}, Buffer timeout: {buffer_timeout}s"
-    )
+    # Records are queued and written to stderr by a listener thread, so worker threads never block on it
+    log_queue = queue.SimpleQueue()
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+    log_listener = QueueListener(log_queue, log_handler)
+    log_listener.start()
 
-    total_processed = 0
-    total_failed = 0
-    total_invalid = 0
-
-    with (
-        get_kafka_consumer(bootstrap_servers, group_id, topic) as consumer,
-        get_db_session(os.environ["DATABASE_URL"]) as session,
-    ):
-        service = StreamingService(
-            consumer=consumer,
-            ml_api_url=ml_api_url,
-            db_session=session,
-            message_batch_size=message_batch_size,
-            buffer_timeout=buffer_timeout,
+    try:
+        # Configuration
+        bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
+        group_id = os.getenv("KAFKA_CONSUMER_GROUP", "transaction-consumer-group")
+        topic = os.getenv("KAFKA_TOPIC", "transactions")
+        fetch_min_bytes = int(os.getenv("KAFKA_FETCH_MIN_BYTES", "65536"))
+        fetch_wait_max_ms = int(os.getenv("KAFKA_FETCH_WAIT_MAX_MS", "100"))
+        ml_api_url = os.getenv("ML_API_URL", "http://localhost:8000")
+
+        message_batch_size = int(os.getenv("MESSAGE_BATCH_SIZE", "50"))
+        api_batch_size = int(os.getenv("API_BATCH_SIZE", "10"))
+        api_max_workers = int(os.getenv("API_MAX_WORKERS", "5"))
+        db_row_batch_size = int(os.getenv("DB_ROW_BATCH_SIZE", "50"))
+        buffer_timeout = float(os.getenv("BUFFER_TIMEOUT", "5.0"))
+        prediction_cache_size = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+        prediction_cache_ttl = float(os.getenv("PREDICTION_CACHE_TTL", "600"))
+
+        logger.info(f"Consumer started - Server: {bootstrap_servers}, Group: {group_id}, Topic: {topic}")
+        logger.info(
+            f"Batch config - Messages: {message_batch_size}, API: {api_batch_size}, "
+            f"DB: {db_row_batch_size}, Buffer timeout: {buffer_timeout}s"
         )
 
-        try:
-            logger.info("Starting continuous batch processing...")
-            while True:
-                # Process one batch window within a transaction
-                with db_transaction(session):
-                    processed, failed, invalid = orchestrate_service(
-                        service=service,
-                        row_batch_size=message_batch_size,
-                        api_batch_size=api_batch_size,
-                        api_max_workers=api_max_workers,
-                        db_row_batch_size=db_row_batch_size,
-                    )
-
-                # Update totals after transaction commits
-                total_processed += processed
-                total_failed += len(failed)
-                total_invalid += len(invalid)
-
-                if processed > 0 or failed or invalid:
-                    logger.info(
-                        f"Batch complete - Processed: {processed}, Failed: {len(failed)}, "
-                        f"Invalid: {len(invalid)} | Total: {total_processed} processed, "
-                        f"{total_failed} failed, {total_invalid} invalid"
-                    )
-
-        except KeyboardInterrupt:
-            logger.info(
-                f"Consumer stopped. Final totals - Processed: {total_processed}, "
-                f"Failed: {total_failed}, Invalid: {total_invalid}"
+        total_processed = 0
+        total_failed = 0
+        total_invalid = 0
+
+        with (
+            get_kafka_consumer(bootstrap_servers, group_id, topic, fetch_min_bytes, fetch_wait_max_ms) as consumer,
+            get_db_session(os.environ["DATABASE_URL"]) as session,
+            ThreadPoolExecutor(max_workers=api_max_workers) as executor,
+            ThreadPoolExecutor(max_workers=1) as db_executor,
+        ):
+            service = StreamingService(
+                consumer=consumer,
+                ml_api_url=ml_api_url,
+                db_session=session,
+                message_batch_size=message_batch_size,
+                buffer_timeout=buffer_timeout,
+                prediction_cache_size=prediction_cache_size,
+                prediction_cache_ttl=prediction_cache_ttl,
+                api_max_workers=api_max_workers,
             )
 
+            try:
+                logger.info("Starting continuous batch processing...")
+                while True:
+                    # Process one batch window within a transaction
+                    with db_transaction(session):
+                        processed, failed, invalid = orchestrate_service(
+                            service=service,
+                            row_batch_size=message_batch_size,
+                            api_batch_size=api_batch_size,
+                            api_max_workers=api_max_workers,
+                            db_row_batch_size=db_row_batch_size,
+                            executor=executor,
+                            db_executor=db_executor,
+                        )
+
+                    # Update totals after transaction commits
+                    total_processed += processed
+                    total_failed += len(failed)
+                    total_invalid += len(invalid)
+
+                    if processed > 0 or failed or invalid:
+                        logger.info(
+                            f"Batch complete - Processed: {processed}, Failed: {len(failed)}, "
+                            f"Invalid: {len(invalid)} | Total: {total_processed} processed, "
+                            f"{total_failed} failed, {total_invalid} invalid | "
+                            f"Consume batch size: {service.consume_batch_size_current}"
+                        )
+
+            except KeyboardInterrupt:
+                logger.info(
+                    f"Consumer stopped. Final totals - Processed: {total_processed}, "
+                    f"Failed: {total_failed}, Invalid: {total_invalid}"
+                )
+    finally:
+        # Runs after every context manager has exited, so their last records are flushed too
+        log_listener.stop()
+
 
 if __name__ == "__main__":
     main()
@@ -13,7 +13,7 @@ import random
 from contextlib import asynccontextmanager
 
 from confluent_kafka.aio import AIOProducer
-from infrastructure.generator import load_and_validate_transactions
+from infrastructure.generator import load_and_validate_transactions, s3_storage_options
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -161,11 +161,9 @@ async def main():
     # Read and validate CSV from MinIO
     s3_path = "s3://transactions/transactions_fr.csv"
 
-    storage_options = {
-        "key": os.environ["KEY"],
-        "secret": os.environ["SECRET"],
-        "client_kwargs": {"endpoint_url": os.environ["ENDPOINT_URL"]},
-    }
+    storage_options = s3_storage_options(
+        key=os.environ["KEY"], secret=os.environ["SECRET"], endpoint_url=os.environ["ENDPOINT_URL"]
+    )
     bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
     topic = os.getenv("KAFKA_TOPIC", "transactions")
     interval = float(os.getenv("PRODUCE_INTERVAL", "0.5"))  # Default: 0.5 second
@@ -9,10 +9,70 @@ import logging
 
 from pydantic import ValidationError as PydanticValidationError
 
-from .model import Transaction
+from .model import Transaction, to_iso_timestamp, uuid4_strings
 
 logger = logging.getLogger(__name__)
 
+STRING_FIELDS = ("description", "operation_type", "side", "processing_type", "run_id")
+
+# Every Transaction field is required (merchant may be None but must be present)
+REQUIRED_FIELDS = frozenset(Transaction.model_fields)
+
+# Compiled core validator, bound once instead of going through BaseModel.__init__
+__validate_transaction = Transaction.__pydantic_validator__.validate_python
+
+
+def __fast_transaction(record: dict, transaction_id: str) -> dict | None:
+    """
+    Build the Transaction.model_dump() dict for an already well-typed record.
+
+    Parameters
+    ----------
+    record : dict
+        Raw transaction record holding every REQUIRED_FIELDS key.
+    transaction_id : str
+        Fresh UUID to assign to the transaction.
+
+    Returns
+    -------
+    dict | None
+        Dumped transaction with transaction_id, or None when the record needs
+        Pydantic (type coercion or an error message).
+
+    Notes
+    -----
+    Only accepts values Pydantic would pass through unchanged (str fields,
+    int/float amount, str or None merchant, a known timestamp format), so
+    the result is identical to Transaction(**record).model_dump().
+    """
+    amount = record["amount"]
+    merchant = record["merchant"]
+    timestamp = record["timestamp"]
+    if (
+        type(amount) not in (float, int)
+        or (merchant is not None and type(merchant) is not str)
+        or type(timestamp) is not str
+        or any(type(record[field]) is not str for field in STRING_FIELDS)
+    ):
+        return None
+
+    try:
+        timestamp = to_iso_timestamp(timestamp)
+    except ValueError:
+        return None
+
+    return {
+        "id": transaction_id,
+        "description": record["description"],
+        "amount": float(amount),
+        "timestamp": timestamp,
+        "merchant": merchant,
+        "operation_type": record["operation_type"],
+        "side": record["side"],
+        "processing_type": record["processing_type"],
+        "run_id": record["run_id"],
+    }
+
 
 def validate_transaction_records(records: list[dict]) -> tuple[list[dict], list[dict]]:
     """
@@ -33,7 +93,13 @@ def validate_transaction_records(records: list[dict]) -> tuple[list[dict], list[
     Notes
     -----
     The Transaction model auto-generates UUIDs via default_factory.
-    Validation errors are logged for debugging purposes.
+    Records missing a field are rejected by a key check without calling
+    Pydantic. Records whose values already have the model's types are
+    dumped directly without instantiating Transaction; anything else
+    (coercible strings, bad types, non-object values) is validated by
+    Pydantic as before.
+    Validation errors are summarised in one warning per call (count, first
+    error and a sample of record ids) so a corrupt batch does not log per row.
     """
     # Validate and auto-assign UUIDs
     validated_transactions = []
@@ -41,23 +107,42 @@ def validate_transaction_records(records: list[dict]) -> tuple[list[dict], list[
 
     logger.info("Validating transactions...")
 
-    for record in records:
+    first_error = None
+    transaction_ids = uuid4_strings(len(records))
+
+    for record, transaction_id in zip(records, transaction_ids, strict=True):
+        if type(record) is dict:
+            # Incomplete records are rejected by a key check instead of a raised ValidationError
+            if not record.keys() >= REQUIRED_FIELDS:
+                invalid_transactions.append(record)
+                if first_error is None:
+                    first_error = f"missing fields {sorted(REQUIRED_FIELDS - record.keys())}"
+                continue
+
+            # Well-typed records skip model instantiation; the rest go through Pydantic
+            transaction = __fast_transaction(record, transaction_id)
+            if transaction is not None:
+                validated_transactions.append(transaction)
+                continue
+
         try:
-            # Transaction model auto-generates UUID via default_factory
-            validated_transactions.append(Transaction(**record).model_dump())
+            # Same as Transaction(**record).model_dump(): the fields are flat scalars, so copying
+            # __dict__ skips the serializer walk; the id validator assigns the UUID
+            validated_transactions.append(__validate_transaction(record).__dict__.copy())
 
         except PydanticValidationError as e:
-            # Collect validation errors
+            # Collect validation errors; logged once below instead of per record
             invalid_transactions.append(record)
-            logger.error(f"Validation failed for record: {e}")
+            if first_error is None:
+                first_error = e
 
     logger.info(f"Validation complete: {len(validated_transactions)} valid, {len(invalid_transactions)} invalid")
 
     if invalid_transactions:
-        logger.warning(f"Found {len(invalid_transactions)} invalid transactions")
+        logger.warning(f"Found {len(invalid_transactions)} invalid transactions; first error: {first_error}")
         # Log a sample of invalid records
         for record in invalid_transactions[:5]:
-            record_id = record.get("id", "unknown")
+            record_id = record.get("id", "unknown") if isinstance(record, dict) else "unknown"
             logger.warning(f"  - Record ID: {record_id}")
 
     return validated_transactions, invalid_transactions
@@ -4,11 +4,88 @@ This module defines Pydantic models for transactions and predictions,
 providing automatic validation, type checking, and UUID generation.
 """
 
+import os
+import re
 from datetime import datetime
 from uuid import uuid4
 
 from pydantic import BaseModel, ConfigDict, field_validator
 
+# Zero-padded shapes the strptime formats accept that datetime.fromisoformat parses identically
+ISO_TIMESTAMP_PATTERN = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}(?:T[0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]{1,6})?| [0-9]{2}:[0-9]{2}:[0-9]{2})"
+)
+TIMESTAMP_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S")
+
+
+def uuid4_strings(n: int) -> list[str]:
+    """
+    Generate n random UUID4 strings in one pass.
+
+    Parameters
+    ----------
+    n : int
+        Number of UUIDs to generate.
+
+    Returns
+    -------
+    list[str]
+        Hyphenated version-4 UUID strings, as str(uuid4()) produces.
+
+    Notes
+    -----
+    Reads 16 * n random bytes with a single os.urandom call, sets the RFC 4122
+    version and variant bits on each 16-byte block, and hex-encodes the whole
+    buffer once, avoiding one UUID object and one syscall per id.
+    """
+    buf = bytearray(os.urandom(16 * n))
+    buf[6::16] = bytes(b & 0x0F | 0x40 for b in buf[6::16])  # version 4
+    buf[8::16] = bytes(b & 0x3F | 0x80 for b in buf[8::16])  # RFC 4122 variant
+    h = buf.hex()
+    return [
+        f"{h[i : i + 8]}-{h[i + 8 : i + 12]}-{h[i + 12 : i + 16]}-{h[i + 16 : i + 20]}-{h[i + 20 : i + 32]}"
+        for i in range(0, 32 * n, 32)
+    ]
+
+
+def to_iso_timestamp(v: str) -> str:
+    """
+    Convert a transaction timestamp string to ISO format.
+
+    Parameters
+    ----------
+    v : str
+        Timestamp in 'YYYY-MM-DD HH:MM:SS', 'YYYY-MM-DDTHH:MM:SS' or
+        'YYYY-MM-DDTHH:MM:SS.ffffff' format.
+
+    Returns
+    -------
+    str
+        ISO format timestamp string.
+
+    Raises
+    ------
+    ValueError
+        If timestamp format is not recognized.
+
+    Notes
+    -----
+    Zero-padded values go through the C-implemented datetime.fromisoformat;
+    anything else (e.g. unpadded months) falls back to strptime with
+    TIMESTAMP_FORMATS, so the accepted inputs are unchanged.
+    """
+    if ISO_TIMESTAMP_PATTERN.fullmatch(v):
+        try:
+            return datetime.fromisoformat(v).isoformat()
+        except ValueError as exc:  # well-formed but out of range, e.g. Feb 30
+            raise ValueError(f"Invalid timestamp format: {v}") from exc
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(v, fmt).isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid timestamp format: {v}")
+
 
 class Transaction(BaseModel):
     """
@@ -102,23 +179,8 @@ class Transaction(BaseModel):
         Supports formats: 'YYYY-MM-DD HH:MM:SS', 'YYYY-MM-DDTHH:MM:SS',
         and 'YYYY-MM-DDTHH:MM:SS.ffffff' (with microseconds).
         Converts to ISO format for consistent database storage.
+        Delegates to to_iso_timestamp.
         """
         if isinstance(v, str):
-            # Handle various timestamp formats
-            try:
-                # Try parsing with microseconds first
-                dt = datetime.strptime(v, "%Y-%m-%dT%H:%M:%S.%f")
-                return dt.isoformat()
-            except ValueError:
-                try:
-                    # Try space-separated format
-                    dt = datetime.strptime(v, "%Y-%m-%d %H:%M:%S")
-                    return dt.isoformat()
-                except ValueError:
-                    try:
-                        # Try basic ISO format
-                        dt = datetime.strptime(v, "%Y-%m-%dT%H:%M:%S")
-                        return dt.isoformat()
-                    except ValueError as exc:
-                        raise ValueError(f"Invalid timestamp format: {v}") from exc
+            return to_iso_timestamp(v)
         return v
@@ -5,9 +5,9 @@ with parallel API calls, error handling, and bulk database operations.
 Coordinates data flow between validation, prediction, and persistence layers.
 """
 
-import functools
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 
 from .protocol import ServiceProtocol
 
@@ -15,7 +15,13 @@ logger = logging.getLogger(__name__)
 
 
 def orchestrate_service(
-    service: ServiceProtocol, row_batch_size: int, api_batch_size: int, api_max_workers: int, db_row_batch_size: int
+    service: ServiceProtocol,
+    row_batch_size: int,
+    api_batch_size: int,
+    api_max_workers: int,
+    db_row_batch_size: int,
+    executor: ThreadPoolExecutor | None = None,
+    db_executor: ThreadPoolExecutor | None = None,
 ) -> tuple[int, list[dict], list[dict]]:
     """
     Orchestrate batch processing of transactions through the pipeline.
@@ -38,6 +44,13 @@ def orchestrate_service(
         Maximum number of parallel workers for API calls.
     db_row_batch_size : int
         Threshold for bulk database writes.
+    executor : ThreadPoolExecutor | None, optional
+        Pool to run API calls on, left open for reuse by the caller
+        (e.g., across streaming batch windows). By default a pool of
+        api_max_workers threads is created for this call.
+    db_executor : ThreadPoolExecutor | None, optional
+        Single-thread pool to run threshold writes on, left open for reuse
+        by the caller. By default a one-thread pool is created for this call.
 
     Returns
     -------
@@ -49,43 +62,49 @@ def orchestrate_service(
 
     Notes
     -----
-    Uses ThreadPoolExecutor for parallel API calls within each batch.
+    Uses a single ThreadPoolExecutor, shared by all batches, for parallel API calls.
     Automatically handles retries via service.predict decorator.
-    Performs bulk database writes when threshold is reached.
+    Performs bulk database writes when threshold is reached. Threshold writes
+    run on a single writer thread while the next API results are collected
+    into fresh buffers; at most one write is in flight, and all writes have
+    finished (errors re-raised) before the final write and return.
     """
     total_processed = 0
     all_predictions = []
     all_valid_transactions = []
     failed_transactions = []
     all_invalid_transactions = []  # Keep track of all invalid transactions
+    pending_write: Future | None = None
+
+    # One pool for the whole run: worker threads are reused across batches instead of respawned per batch
+    with (
+        nullcontext(executor) if executor else ThreadPoolExecutor(max_workers=api_max_workers) as executor,
+        nullcontext(db_executor) if db_executor else ThreadPoolExecutor(max_workers=1) as db_executor,
+    ):
+        # Load and validate transactions - returns generator and invalid transactions
+        for batch_id, (valid_transactions, invalid_transactions) in enumerate(service.read(row_batch_size)):
+            # Log invalid transactions
+            if invalid_transactions:
+                all_invalid_transactions.extend(invalid_transactions)
+                logger.error(
+                    f"Batch {batch_id}: Found {len(invalid_transactions)} invalid transactions during validation"
+                )
+                for error in invalid_transactions[:5]:  # Show first 5
+                    logger.error(f"  - {error}")
+
+            if not valid_transactions:
+                logger.warning(f"Batch {batch_id}: No valid transactions to process")
+                continue
+
+            logger.info(
+                f"Batch {batch_id}: Processing {len(valid_transactions)} transactions "
+                f"with {api_max_workers} parallel workers, API batch size: {api_batch_size}"
+            )
 
-    # Load and validate transactions - returns generator and invalid transactions
-    for batch_id, (valid_transactions, invalid_transactions) in enumerate(service.read(row_batch_size)):
-        # Log invalid transactions
-        if invalid_transactions:
-            all_invalid_transactions.extend(invalid_transactions)
-            logger.error(f"Batch {batch_id}: Found {len(invalid_transactions)} invalid transactions during validation")
-            for error in invalid_transactions[:5]:  # Show first 5
-                logger.error(f"  - {error}")
-
-        if not valid_transactions:
-            logger.warning(f"Batch {batch_id}: No valid transactions to process")
-            continue
-
-        logger.info(
-            f"Batch {batch_id}: Processing {len(valid_transactions)} transactions "
-            f"with {api_max_workers} parallel workers, API batch size: {api_batch_size}"
-        )
-
-        # Process API batches in parallel using ThreadPoolExecutor (INSIDE the loop)
-        with ThreadPoolExecutor(max_workers=api_max_workers) as executor:
-            # Map predict_batch function over API batches in parallel
+            # Map service.predict over API batches in parallel
             results = executor.map(
-                lambda args: functools.partial(service.predict)(args[1]),
-                enumerate(
-                    valid_transactions[i : i + api_batch_size]
-                    for i in range(0, len(valid_transactions), api_batch_size)
-                ),
+                service.predict,
+                (valid_transactions[i : i + api_batch_size] for i in range(0, len(valid_transactions), api_batch_size)),
             )
 
             for result in results:
@@ -100,15 +119,23 @@ def orchestrate_service(
                     logger.warning(f"Batch {batch_id}: {len(transactions)} transactions added to failed queue")
 
                 if len(all_predictions) >= db_row_batch_size or len(all_valid_transactions) >= db_row_batch_size:
-                    # Write results to database in bulk
-                    service.bulk_write(all_valid_transactions, all_predictions)
+                    # Double-buffer: hand the full buffers to the writer thread and keep collecting into new ones
+                    if pending_write is not None:
+                        pending_write.result()
+                    pending_write = db_executor.submit(service.bulk_write, all_valid_transactions, all_predictions)
+                    all_valid_transactions, all_predictions = [], []
+
+            logger.info(
+                f"Batch {batch_id}: Completed. Total progress: {total_processed}/"
+                f"{total_processed + len(failed_transactions)} successful"
+            )
 
-        logger.info(
-            f"Batch {batch_id}: Completed. Total progress: {total_processed}/"
-            f"{total_processed + len(failed_transactions)} successful"
-        )
+        if pending_write is not None:
+            pending_write.result()
 
-    service.bulk_write(all_valid_transactions, all_predictions)
+    # Flush the remainder; threshold writes already consumed their own buffers
+    if all_valid_transactions or all_predictions:
+        service.bulk_write(all_valid_transactions, all_predictions)
 
     # Final summary after ALL batches processed (outside context manager)
     logger.info(f"Batch pipeline completed - {total_processed} predictions received")
@@ -7,14 +7,25 @@ This package provides core infrastructure components including:
 - Base service classes for pipeline orchestration
 """
 
-from .api import predict_batch
-from .database import db_transaction, db_write_results, get_db_session
+from .api import create_http_session, predict_batch
+from .database import (
+    db_create_secondary_indexes,
+    db_drop_secondary_indexes,
+    db_transaction,
+    db_write_results,
+    get_db_session,
+    with_connection_params,
+)
 from .service import BaseService
 
 __all__ = [
     "predict_batch",
+    "create_http_session",
     "db_write_results",
+    "db_drop_secondary_indexes",
+    "db_create_secondary_indexes",
     "get_db_session",
     "db_transaction",
+    "with_connection_params",
     "BaseService",
 ]
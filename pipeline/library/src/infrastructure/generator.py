@@ -1,7 +1,7 @@
 """Data loading and validation module.
 
 This module provides functions for loading transaction data from S3/MinIO,
-validating transactions using Pydantic models, and yielding batches for
+validating transactions against the Transaction schema, and yielding batches for
 processing in the pipeline.
 """
 
@@ -10,29 +10,105 @@ from collections.abc import Iterator
 
 import polars as pl
 
-from core.data_validation import validate_transaction_records
+from core.model import Transaction, uuid4_strings
 
 logger = logging.getLogger(__name__)
 
+# Columns validated as strings by the Transaction model
+STRING_COLUMNS = ["description", "merchant", "operation_type", "side"]
 
-def __validate_transaction_dataframe(df: pl.DataFrame, run_id: str, processing_type: str) -> pl.DataFrame:
-    # Check for required columns
+# Transaction fields in model_dump() order
+TRANSACTION_FIELDS = list(Transaction.model_fields)
+
+# Timestamp layouts accepted by Transaction.parse_timestamp, in Polars syntax
+TIMESTAMP_FORMATS = ("%Y-%m-%dT%H:%M:%S%.f", "%Y-%m-%d %H:%M:%S")
+
+# Polars' %.f also takes 7-9 fractional digits (truncating them); strptime's %f stops at 6
+OVERLONG_FRACTION_PATTERN = r"\.[0-9]{7,}$"
+
+
+def s3_storage_options(key: str, secret: str, endpoint_url: str, region: str = "us-east-1") -> dict[str, str]:
+    """
+    Build Polars storage options for an S3-compatible endpoint such as MinIO.
+
+    Parameters
+    ----------
+    key : str
+        Access key id.
+    secret : str
+        Secret access key.
+    endpoint_url : str
+        Endpoint URL (e.g., 'http://minio:9000').
+    region : str, optional
+        Region name sent in request signatures, by default 'us-east-1'.
+
+    Returns
+    -------
+    dict[str, str]
+        Flat object_store configuration keys for pl.scan_csv.
+
+    Notes
+    -----
+    Polars' native cloud reader only accepts flat string options; the
+    fsspec-style {'key', 'secret', 'client_kwargs'} layout is rejected.
+    Plain-HTTP endpoints are allowed when endpoint_url uses http://.
+
+    Examples
+    --------
+    >>> s3_storage_options("minio", "minio123", "http://minio:9000")["aws_allow_http"]
+    'true'
+    """
+    return {
+        "aws_access_key_id": key,
+        "aws_secret_access_key": secret,
+        "aws_endpoint_url": endpoint_url,
+        "aws_allow_http": str(endpoint_url.startswith("http://")).lower(),
+        "aws_region": region,
+    }
+
+
+def __validate_transaction_dataframe(lf: pl.LazyFrame, run_id: str, processing_type: str) -> pl.LazyFrame:
+    # Check for required columns (reads only the header)
     required_cols = {"id", "description", "amount", "timestamp", "merchant", "operation_type", "side"}
-    missing = required_cols - set(df.columns)
+    missing = required_cols - set(lf.collect_schema().names())
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
 
     # Add lineage tracking columns
-    df = df.with_columns([pl.lit(run_id).alias("run_id"), pl.lit(processing_type).alias("processing_type")])
-
-    # Check for null values
-    null_counts = df.null_count()
-    total_nulls = sum([null_counts[col][0] for col in null_counts.columns])
-    if total_nulls > 0:
-        logger.warning(f"Found {total_nulls} null values in data - these rows will be filtered")
-        df = df.drop_nulls()
-        logger.info(f"After filtering nulls: {len(df)} transactions remain")
-    return df
+    return lf.with_columns([pl.lit(run_id).alias("run_id"), pl.lit(processing_type).alias("processing_type")])
+
+
+def __split_invalid_rows(df: pl.DataFrame) -> tuple[pl.DataFrame, pl.DataFrame]:
+    # Enforce the Transaction schema with columnar casts; failed casts become nulls
+    timestamp = pl.col("timestamp").cast(pl.String)
+    typed = df.with_columns(
+        # Amounts use a decimal comma in the source CSV
+        pl.col("amount").cast(pl.String).str.replace(",", ".", literal=True).cast(pl.Float64, strict=False),
+        pl.col(STRING_COLUMNS).cast(pl.String),
+        pl.when(timestamp.str.contains(OVERLONG_FRACTION_PATTERN))
+        .then(None)
+        .otherwise(pl.coalesce(timestamp.str.to_datetime(fmt, strict=False) for fmt in TIMESTAMP_FORMATS))
+        .alias("__parsed_timestamp"),
+    )
+    valid_mask = pl.all_horizontal(pl.all().is_not_null())
+    return typed.filter(valid_mask), df.filter(~typed.select(valid_mask).to_series())
+
+
+def __to_transaction_records(df: pl.DataFrame) -> list[dict]:
+    # Rows already passed every Transaction check: build Transaction(**row).model_dump() output in Polars
+    parsed = pl.col("__parsed_timestamp")
+    return (
+        df.with_columns(
+            pl.Series("id", uuid4_strings(len(df)), dtype=pl.String),
+            # Match datetime.isoformat(): fractional seconds only when present
+            pl.when(parsed.dt.microsecond() == 0)
+            .then(parsed.dt.strftime("%Y-%m-%dT%H:%M:%S"))
+            .otherwise(parsed.dt.strftime("%Y-%m-%dT%H:%M:%S%.6f"))
+            .alias("timestamp"),
+        )
+        .select(TRANSACTION_FIELDS)
+        .to_dicts()
+    )
 
 
 def load_and_validate_transactions(
@@ -41,17 +117,17 @@ def load_and_validate_transactions(
     """
     Load transactions from S3/MinIO and yield validated batches.
 
-    This function reads CSV data from S3, validates each transaction
-    with Pydantic (auto-assigning UUIDs), and yields batches of
-    validated transactions.
+    This function streams CSV data from S3, validates each transaction
+    against the Transaction schema with columnar Polars checks
+    (auto-assigning UUIDs), and yields batches of validated transactions.
 
     Parameters
     ----------
     s3_path : str
         S3 path to CSV file (e.g., 's3://bucket/file.csv').
     storage_options : dict
-        S3/MinIO credentials containing 'key', 'secret', and
-        'client_kwargs' with 'endpoint_url'.
+        Polars object_store options for the bucket, as built by
+        s3_storage_options (empty for local paths).
     batch_size : int, optional
         Number of transactions per batch, by default 100.
 
@@ -67,17 +143,28 @@ def load_and_validate_transactions(
 
     Notes
     -----
+    The file is scanned lazily and pulled in batch_size chunks, so the
+    whole CSV is never materialised in memory.
     Invalid transactions are collected and yielded alongside
-    valid transactions for error reporting.
+    valid transactions for error reporting. Rows with null values,
+    non-numeric amounts or unrecognised timestamps (including more
+    than the 6 fractional digits Transaction accepts) are reported as
+    invalid. Valid rows are emitted with the same fields and formats as
+    Transaction.model_dump(), without instantiating a model per row.
     """
     logger.info(f"Reading data from {s3_path}")
 
-    # Read CSV with Polars
-    df = pl.read_csv(s3_path, separator=";", decimal_comma=True, storage_options=storage_options)
+    # Stream the CSV in batch_size chunks; every column is read as a string and typed by the columnar checks
+    lf = pl.scan_csv(s3_path, separator=";", infer_schema=False, storage_options=storage_options)
 
-    logger.info(f"Loaded {len(df)} raw transactions from CSV")
+    total_rows = 0
+    for batch_df in __validate_transaction_dataframe(
+        lf, run_id=run_id, processing_type=processing_type
+    ).collect_batches(chunk_size=batch_size):
+        total_rows += len(batch_df)
+        valid_df, rejected_df = __split_invalid_rows(batch_df)
+        if len(rejected_df):
+            logger.warning(f"Found {len(rejected_df)} rows with null or malformed values - reported as invalid")
+        yield __to_transaction_records(valid_df), rejected_df.to_dicts()
 
-    for sub_df in __validate_transaction_dataframe(df, run_id=run_id, processing_type=processing_type).iter_slices(
-        n_rows=batch_size
-    ):
-        yield validate_transaction_records(sub_df.to_dicts())
+    logger.info(f"Loaded {total_rows} raw transactions from CSV")
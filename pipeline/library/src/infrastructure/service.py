@@ -7,7 +7,7 @@ and database persistence.
 
 from sqlalchemy.orm import Session
 
-from .api import predict_batch
+from .api import HTTP_POOL_SIZE, create_http_session, predict_batch
 from .database import db_write_results
 
 
@@ -26,6 +26,8 @@ class BaseService:
         URL for ML classification API.
     db_session : Session
         SQLAlchemy database session for persistence.
+    http_session : requests.Session
+        HTTP session shared by predict() calls for connection keep-alive.
 
     Methods
     -------
@@ -42,7 +44,7 @@ class BaseService:
     for their specific data sources (S3, Kafka, etc.).
     """
 
-    def __init__(self, ml_api_url: str, db_session: Session) -> None:
+    def __init__(self, ml_api_url: str, db_session: Session, api_max_workers: int = 10) -> None:
         """
         Initialize BaseService with ML API and database configuration.
 
@@ -52,6 +54,10 @@ class BaseService:
             ML API endpoint URL for classification predictions.
         db_session : Session
             SQLAlchemy session for database operations.
+        api_max_workers : int, optional
+            Threads calling predict() concurrently, by default 10. The
+            HTTP connection pool holds one connection per worker unless
+            HTTP_POOL_SIZE overrides it.
 
         Notes
         -----
@@ -60,6 +66,7 @@ class BaseService:
         """
         self.ml_api_url = ml_api_url
         self.db_session = db_session
+        self.http_session = create_http_session(HTTP_POOL_SIZE or api_max_workers)
 
     def predict(self, transactions: list[dict]) -> tuple[list[dict], list[dict]]:
         """
@@ -80,8 +87,10 @@ class BaseService:
         Notes
         -----
         Delegates to predict_batch() with automatic retry logic.
+        Reuses self.http_session so worker threads skip TCP setup
+        on every batch.
         """
-        return predict_batch(transactions, self.ml_api_url)
+        return predict_batch(transactions, self.ml_api_url, session=self.http_session)
 
     def bulk_write(self, transactions: list[dict], predictions: list[dict]) -> None:
         """
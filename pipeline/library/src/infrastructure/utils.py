@@ -5,6 +5,8 @@ backoff for handling transient failures in API calls and database operations.
 """
 
 import logging
+import os
+import random
 import time
 from collections.abc import Callable
 from functools import wraps
@@ -13,17 +15,30 @@ import requests
 
 logger = logging.getLogger(__name__)
 
+# HTTP statuses worth retrying; other 4xx responses fail the same way on every attempt
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
 
-def retry_with_backoff(max_retries: int = 3, initial_delay: float = 1.0):
+
+def __is_retryable(exc: requests.exceptions.RequestException) -> bool:
+    # Connection errors, timeouts and bad JSON have no response status and are always retried
+    response = exc.response if isinstance(exc, requests.exceptions.HTTPError) else None
+    return response is None or response.status_code in RETRYABLE_STATUS_CODES
+
+
+def retry_with_backoff(max_retries: int | None = None, initial_delay: float = 1.0, max_delay: float = 30.0):
     """
     Decorate a function with exponential backoff retry logic.
 
     Parameters
     ----------
-    max_retries : int, optional
-        Maximum number of retry attempts, by default 3.
+    max_retries : int | None, optional
+        Maximum number of retry attempts, by default None: the MAX_RETRIES
+        environment variable (default 3), read on every call so the
+        policy can be changed without re-importing.
     initial_delay : float, optional
         Initial delay in seconds for exponential backoff, by default 1.0.
+    max_delay : float, optional
+        Upper bound in seconds for the backoff delay, by default 30.0.
 
     Returns
     -------
@@ -33,7 +48,10 @@ def retry_with_backoff(max_retries: int = 3, initial_delay: float = 1.0):
 
     Notes
     -----
-    The delay doubles after each failed attempt (exponential backoff).
+    The delay doubles after each failed attempt (exponential backoff, capped
+    at max_delay) and each sleep is jittered to 50-100% of it, so worker
+    threads failing together do not retry in lockstep. HTTP errors whose
+    status is not in RETRYABLE_STATUS_CODES fail immediately.
     Failed batches are logged and their transactions are returned for
     potential reprocessing.
     """
@@ -41,11 +59,12 @@ def retry_with_backoff(max_retries: int = 3, initial_delay: float = 1.0):
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs) -> tuple[list[dict] | None, list[dict] | None]:
+            attempts = max_retries if max_retries is not None else int(os.getenv("MAX_RETRIES", "3"))
             delay = initial_delay
             transactions = args[0] if args else None
             batch_id = args[1] if len(args) > 1 else kwargs.get("batch_id", "unknown")
 
-            for attempt in range(max_retries):
+            for attempt in range(attempts):
                 try:
                     result = func(*args, **kwargs)
 
@@ -55,16 +74,22 @@ def retry_with_backoff(max_retries: int = 3, initial_delay: float = 1.0):
                     return result
 
                 except requests.exceptions.RequestException as e:
-                    if attempt < max_retries - 1:
+                    if not __is_retryable(e):
+                        logger.error(
+                            f"Batch {batch_id}: Non-retryable error - {e}. Moving transactions to failed queue."
+                        )
+                        return transactions, None
+                    if attempt < attempts - 1:
+                        sleep_seconds = delay * (0.5 + random.random() * 0.5)  # Jitter
                         logger.warning(
-                            f"Batch {batch_id}: Attempt {attempt + 1}/{max_retries} failed - {e}. "
-                            f"Retrying in {delay:.1f}s..."
+                            f"Batch {batch_id}: Attempt {attempt + 1}/{attempts} failed - {e}. "
+                            f"Retrying in {sleep_seconds:.1f}s..."
                         )
-                        time.sleep(delay)
-                        delay *= 2  # Exponential backoff
+                        time.sleep(sleep_seconds)
+                        delay = min(delay * 2, max_delay)  # Exponential backoff
                     else:
                         logger.error(
-                            f"Batch {batch_id}: All {max_retries} attempts failed - {e}. "
+                            f"Batch {batch_id}: All {attempts} attempts failed - {e}. "
                             f"Moving transactions to failed queue."
                         )
                         return transactions, None
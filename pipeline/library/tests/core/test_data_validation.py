@@ -5,9 +5,12 @@ Covers validation of transaction records with various scenarios:
 all valid, all invalid, and mixed batches.
 """
 
+import uuid
+
 import pytest
 
 from core.data_validation import validate_transaction_records
+from core.model import Transaction
 
 
 class TestValidateTransactionRecords:
@@ -98,8 +101,7 @@ class TestValidateTransactionRecords:
         # Check that UUIDs were generated for all validated transactions
         for transaction in validated:
             assert "id" in transaction
-            assert transaction["id"] != ""
-            assert len(transaction["id"]) == 36  # UUID length with hyphens
+            assert str(uuid.UUID(transaction["id"])) == transaction["id"]  # canonical hyphenated UUID
 
     @pytest.mark.parametrize(
         "invalid_records,expected_invalid_count",
@@ -325,7 +327,7 @@ class TestValidateTransactionRecords:
         # Verify all validated have UUIDs
         for transaction in validated:
             assert "id" in transaction
-            assert len(transaction["id"]) == 36
+            assert str(uuid.UUID(transaction["id"])) == transaction["id"]
 
     def test_empty_input(self):
         """Test validation with empty list."""
@@ -371,3 +373,62 @@ class TestValidateTransactionRecords:
 
         # Check UUID was generated (not original id)
         assert transaction["id"] != "original-id"
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {},
+            {"amount": 12},
+            {"merchant": None},
+            {"timestamp": "2026-01-11 10:00:00"},
+            {"timestamp": "2026-01-11T10:00:00.250000"},
+            {"amount": "12.5"},
+            {"amount": True},
+        ],
+    )
+    def test_matches_pydantic_model_dump(self, overrides):
+        """Test that validated output equals Transaction.model_dump() apart from the UUID."""
+        record = {
+            "id": "original-id",
+            "description": "Test payment",
+            "amount": 123.45,
+            "timestamp": "2026-01-11T10:00:00",
+            "merchant": "Test Merchant",
+            "operation_type": "debit",
+            "side": "customer",
+            "processing_type": "streaming",
+            "run_id": "kafka-123",
+            **overrides,
+        }
+
+        validated, invalid = validate_transaction_records([record])
+        expected = Transaction(**record).model_dump()
+
+        assert invalid == []
+        assert list(validated[0]) == list(expected)
+        assert {**validated[0], "id": None} == {**expected, "id": None}
+
+    def test_missing_merchant_is_invalid(self):
+        """Test that merchant is required even though it may be None."""
+        record = {
+            "id": "1",
+            "description": "Payment",
+            "amount": 100.0,
+            "timestamp": "2026-01-11T10:00:00",
+            "operation_type": "debit",
+            "side": "customer",
+            "processing_type": "batch",
+            "run_id": "run-1",
+        }
+
+        validated, invalid = validate_transaction_records([record])
+
+        assert validated == []
+        assert invalid == [record]
+
+    def test_non_object_messages_are_invalid(self):
+        """Test that decoded JSON values other than objects are reported as invalid."""
+        validated, invalid = validate_transaction_records([[1, 2], "text", 5])
+
+        assert validated == []
+        assert invalid == [[1, 2], "text", 5]
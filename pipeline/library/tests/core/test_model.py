@@ -4,12 +4,13 @@ Tests for the Transaction Pydantic model.
 Covers validation, UUID generation, timestamp parsing, and lineage fields.
 """
 
-import re
+import uuid
+from datetime import datetime
 
 import pytest
 from pydantic import ValidationError
 
-from core.model import Transaction
+from core.model import TIMESTAMP_FORMATS, Transaction, to_iso_timestamp, uuid4_strings
 
 
 class TestTransactionModel:
@@ -92,7 +93,7 @@ class TestTransactionModel:
 
         # Check UUID was generated (not the original id)
         assert transaction.id != transaction_data["id"]
-        assert re.match(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", transaction.id)
+        assert str(uuid.UUID(transaction.id)) == transaction.id  # canonical lowercase hyphenated form
 
         # Check expected fields match
         for field, value in expected_fields.items():
@@ -260,3 +261,59 @@ class TestTransactionModel:
         # Verify lineage fields have correct values
         assert dumped["processing_type"] == "batch"
         assert dumped["run_id"] == "airflow-run-xyz"
+
+
+def _strptime_iso(v: str) -> str | None:
+    """Reference parser: the strptime ladder used before the ISO fast path."""
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(v, fmt).isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+class TestToIsoTimestamp:
+    """Test suite for the timestamp normalisation helper."""
+
+    @pytest.mark.parametrize(
+        "timestamp_str",
+        [
+            "2026-01-11T10:00:00",
+            "2026-01-11 10:00:00",
+            "2026-01-11T10:00:00.5",
+            "2026-01-11T10:00:00.000000",
+            "2026-1-5 1:2:3",
+            "2026-01-11T10:00:00.1234567",
+            "2026-01-11 10:00:00.5",
+            "2026-02-30 10:00:00",
+            "2026-01-11",
+            "2026-01-11T10:00:00+01:00",
+        ],
+    )
+    def test_matches_strptime_formats(self, timestamp_str):
+        """Test that the fast path accepts and normalises exactly what strptime did."""
+        expected = _strptime_iso(timestamp_str)
+
+        if expected is None:
+            with pytest.raises(ValueError, match="Invalid timestamp format"):
+                to_iso_timestamp(timestamp_str)
+        else:
+            assert to_iso_timestamp(timestamp_str) == expected
+
+
+class TestUuid4Strings:
+    """Test suite for bulk UUID generation."""
+
+    @pytest.mark.parametrize("n", [0, 1, 1000])
+    def test_generates_unique_version_4_uuids(self, n):
+        """Test that ids are distinct RFC 4122 version-4 UUIDs in str(uuid4()) form."""
+        ids = uuid4_strings(n)
+
+        assert len(ids) == n
+        assert len(set(ids)) == n
+        for value in ids:
+            parsed = uuid.UUID(value)
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+            assert str(parsed) == value
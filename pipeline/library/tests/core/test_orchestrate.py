@@ -5,7 +5,10 @@ Tests different batch processing strategies using a mock service
 that implements the ServiceProtocol.
 """
 
+import threading
+import time
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -443,3 +446,57 @@ class TestOrchestrateService:
 
         assert total_processed == len(input_transactions)
         assert mock_service.written_predictions == expected_predictions
+
+    def test_threshold_writes_run_off_the_calling_thread(self):
+        """Test that threshold writes are handed off and all finish before returning."""
+        transactions = [self._create_transaction(str(i)) for i in range(25)]
+        mock_service = MockService(data_batches=[transactions])
+        write_threads = []
+        bulk_write = mock_service.bulk_write
+
+        def slow_bulk_write(transactions: list[dict], predictions: list[dict]) -> None:
+            write_threads.append(threading.current_thread())
+            time.sleep(0.01)
+            bulk_write(transactions, predictions)
+
+        mock_service.bulk_write = slow_bulk_write
+
+        total_processed, _, _ = orchestrate_service(
+            service=mock_service,
+            row_batch_size=30,
+            api_batch_size=5,
+            api_max_workers=2,
+            db_row_batch_size=10,
+        )
+
+        assert total_processed == 25
+        assert [tx["id"] for tx in mock_service.written_transactions] == [str(i) for i in range(25)]
+        assert threading.main_thread() not in write_threads[:-1]
+        assert write_threads[-1] is threading.main_thread()
+
+    def test_caller_owned_db_executor_is_reused(self):
+        """Test that threshold writes run on a caller's writer pool, which stays open across calls."""
+        writer_threads = set()
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="writer") as db_executor:
+            for _ in range(2):
+                mock_service = MockService(data_batches=[[self._create_transaction(str(i)) for i in range(20)]])
+                bulk_write = mock_service.bulk_write
+
+                def recording_bulk_write(transactions: list[dict], predictions: list[dict], bulk_write=bulk_write):
+                    writer_threads.add(threading.current_thread().name)
+                    bulk_write(transactions, predictions)
+
+                mock_service.bulk_write = recording_bulk_write
+                orchestrate_service(
+                    service=mock_service,
+                    row_batch_size=20,
+                    api_batch_size=5,
+                    api_max_workers=2,
+                    db_row_batch_size=10,
+                    db_executor=db_executor,
+                )
+
+            assert db_executor.submit(lambda: "open").result() == "open"
+
+        assert {name for name in writer_threads if name.startswith("writer")} == {"writer_0"}
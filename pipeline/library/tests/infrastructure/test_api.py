@@ -0,0 +1,86 @@
+"""
+Tests for ML API client module.
+
+Uses a stub HTTP session so no ML API needs to be running.
+"""
+
+import gzip
+
+import orjson
+import pytest
+
+from infrastructure import api, service
+from infrastructure.api import create_http_session, predict_batch
+
+
+class StubResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, payload: list[dict]) -> None:
+        self.content = orjson.dumps(payload)
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class StubSession:
+    """Records POST calls instead of sending them."""
+
+    def __init__(self, payload: list[dict]) -> None:
+        self.payload = payload
+        self.calls = []
+
+    def post(self, url: str, **kwargs) -> StubResponse:
+        self.calls.append((url, kwargs))
+        return StubResponse(self.payload)
+
+
+class TestPredictBatch:
+    """Test suite for predict_batch."""
+
+    def test_posts_through_given_session(self):
+        """Test that the provided session is reused for the request."""
+        session = StubSession([{"transaction_id": "tx-1", "category": "food"}])
+        transactions = [{"id": "tx-1"}]
+
+        result = predict_batch(transactions, "http://ml-api:8000", session=session)
+
+        assert result == (transactions, session.payload)
+        [(url, kwargs)] = session.calls
+        assert url == "http://ml-api:8000/predict"
+        assert orjson.loads(kwargs["data"]) == transactions
+        assert "Content-Encoding" not in kwargs["headers"]
+
+    @pytest.mark.parametrize("min_bytes,compressed", [(1, True), (10_000, False)])
+    def test_gzips_bodies_above_threshold(self, monkeypatch, min_bytes, compressed):
+        """Test that bodies of at least ML_API_GZIP_MIN_BYTES are sent gzip-encoded."""
+        monkeypatch.setattr(api, "ML_API_GZIP_MIN_BYTES", min_bytes)
+        session = StubSession([])
+        transactions = [{"id": "tx-1", "description": "Payment"}]
+
+        predict_batch(transactions, "http://ml-api:8000", session=session)
+
+        [(_, kwargs)] = session.calls
+        body = gzip.decompress(kwargs["data"]) if compressed else kwargs["data"]
+        assert orjson.loads(body) == transactions
+        assert ("Content-Encoding" in kwargs["headers"]) is compressed
+
+
+class TestCreateHttpSession:
+    """Test suite for create_http_session."""
+
+    def test_pool_sized_for_workers(self):
+        """Test that the mounted adapters keep one connection per worker."""
+        session = create_http_session(pool_size=32)
+
+        for prefix in ("http://", "https://"):
+            assert session.get_adapter(f"{prefix}ml-api")._pool_maxsize == 32
+
+    @pytest.mark.parametrize("override,expected_pool_size", [(0, 32), (8, 8)])
+    def test_service_pool_follows_api_max_workers(self, monkeypatch, override, expected_pool_size):
+        """Test that BaseService sizes its pool from api_max_workers unless HTTP_POOL_SIZE is set."""
+        monkeypatch.setattr(service, "HTTP_POOL_SIZE", override)
+
+        base_service = service.BaseService(ml_api_url="http://ml-api:8000", db_session=None, api_max_workers=32)
+
+        assert base_service.http_session.get_adapter("http://ml-api")._pool_maxsize == expected_pool_size
@@ -0,0 +1,218 @@
+"""
+Tests for database operations module.
+
+Covers the pure helpers used by the bulk write paths; statements that
+need a live PostgreSQL connection are not exercised here.
+"""
+
+import csv
+
+import pytest
+
+from infrastructure import database
+
+copy_buffer = getattr(database, "__copy_buffer")
+
+
+class TestTransactionsCopyBuffer:
+    """Test suite for COPY buffer encoding."""
+
+    def _create_transaction(self, id: str, **overrides) -> dict:
+        """Helper to create a transaction dict."""
+        transaction = {
+            "id": id,
+            "description": f"Transaction {id}",
+            "amount": 100.0,
+            "timestamp": "2026-01-11T10:00:00",
+            "merchant": "Test Merchant",
+            "operation_type": "debit",
+            "side": "customer",
+            "processing_type": "batch",
+            "run_id": "test-run",
+        }
+        transaction.update(overrides)
+        return transaction
+
+    @pytest.mark.parametrize("num_transactions", [1, 3, 50])
+    def test_one_line_per_transaction_in_column_order(self, num_transactions):
+        """Test that each transaction becomes one CSV row ordered like TRANSACTION_COLUMNS."""
+        transactions = [self._create_transaction(str(i)) for i in range(num_transactions)]
+
+        rows = list(csv.reader(copy_buffer(transactions, database.TRANSACTION_COLUMNS)))
+
+        assert len(rows) == num_transactions
+        for row, transaction in zip(rows, transactions, strict=True):
+            assert row == [str(transaction[column]) for column in database.TRANSACTION_COLUMNS]
+
+    @pytest.mark.parametrize(
+        "overrides,expected_line",
+        [
+            # None is written as an unquoted empty field (NULL for COPY)
+            (
+                {"merchant": None},
+                '"1","Transaction 1","100.0","2026-01-11T10:00:00",,"debit","customer","batch","test-run"\n',
+            ),
+            # An empty string is quoted, so COPY keeps it as '' instead of NULL
+            (
+                {"description": ""},
+                '"1","","100.0","2026-01-11T10:00:00","Test Merchant","debit","customer","batch","test-run"\n',
+            ),
+            # Separators and quotes inside values are escaped
+            (
+                {"description": 'Coffee, "large"'},
+                '"1","Coffee, ""large""","100.0","2026-01-11T10:00:00","Test Merchant","debit","customer","batch",'
+                '"test-run"\n',
+            ),
+        ],
+    )
+    def test_special_values_are_escaped(self, overrides, expected_line):
+        """Test NULL and quoting behaviour of the encoded buffer."""
+        buffer = copy_buffer([self._create_transaction("1", **overrides)], database.TRANSACTION_COLUMNS)
+
+        assert buffer.getvalue() == expected_line
+
+    def test_only_listed_columns_are_written(self):
+        """Test that prediction buffers carry just PREDICTION_COLUMNS."""
+        predictions = [{"transaction_id": "tx-1", "category": "Food", "confidence_score": 0.9}]
+
+        buffer = copy_buffer(predictions, database.PREDICTION_COLUMNS)
+
+        assert buffer.getvalue() == '"tx-1","Food"\n'
+
+    def test_empty_string_round_trips_distinct_from_null(self):
+        """Test that '' and None decode differently under COPY's CSV NULL rule."""
+        buffer = copy_buffer(
+            [{"transaction_id": "tx-1", "category": ""}, {"transaction_id": "tx-2", "category": None}],
+            database.PREDICTION_COLUMNS,
+        )
+
+        # COPY ... (FORMAT CSV) reads an unquoted empty field as NULL and a quoted one as ''
+        decoded = [
+            tuple(None if field == "" else field.strip('"') for field in line.split(","))
+            for line in buffer.getvalue().splitlines()
+        ]
+
+        assert decoded == [("tx-1", ""), ("tx-2", None)]
+
+
+class TestWithConnectionParams:
+    """Test suite for database URL parameter merging."""
+
+    @pytest.mark.parametrize(
+        "database_url,params,expected_url",
+        [
+            # Parameters are appended to a bare URL
+            (
+                "postgresql://user:pass@db:5432/tx",
+                {"application_name": "batch_1"},
+                "postgresql://user:pass@db:5432/tx?application_name=batch_1",
+            ),
+            # Spaces in server options are percent-encoded
+            (
+                "postgresql://user:pass@db:5432/tx",
+                {"options": "-c synchronous_commit=off"},
+                "postgresql://user:pass@db:5432/tx?options=-c%20synchronous_commit%3Doff",
+            ),
+            # Existing parameters take precedence over injected ones
+            (
+                "postgresql://user:pass@db:5432/tx?application_name=from_dag",
+                {"application_name": "batch_1", "sslmode": "disable"},
+                "postgresql://user:pass@db:5432/tx?application_name=from_dag&sslmode=disable",
+            ),
+        ],
+    )
+    def test_params_are_merged(self, database_url, params, expected_url):
+        """Test that parameters are merged without overriding the URL's own query."""
+        assert database.with_connection_params(database_url, **params) == expected_url
+
+
+class RecordingResult:
+    """Rows returned for a recorded statement."""
+
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+
+    def all(self) -> list:
+        return self.rows
+
+    def scalars(self) -> "RecordingResult":
+        return RecordingResult([row[0] for row in self.rows])
+
+
+class RecordingSession:
+    """Records SQL text passed to execute() instead of running it."""
+
+    def __init__(self, results: dict[str, list[tuple]] | None = None) -> None:
+        self.statements = []
+        self.execution_options = None
+        self.results = results or {}  # SQL fragment -> rows returned by the first statement containing it
+
+    def execute(self, statement, params=None) -> RecordingResult:
+        sql = str(statement)
+        self.statements.append(sql)
+        return RecordingResult(next((rows for fragment, rows in self.results.items() if fragment in sql), []))
+
+    def connection(self, execution_options=None) -> "RecordingSession":
+        self.execution_options = execution_options
+        return self
+
+
+class TestSecondaryIndexes:
+    """Test suite for dropping and rebuilding secondary indexes."""
+
+    INDEX_DEFINITIONS = [
+        ("idx_category", "CREATE INDEX idx_category ON public.predictions USING btree (category)"),
+        ("idx_timestamp", 'CREATE INDEX idx_timestamp ON public.transactions USING btree ("timestamp")'),
+    ]
+
+    def test_drop_records_definitions_before_dropping(self):
+        """Test that each catalog index is saved to bulk_reload_indexes, then dropped."""
+        session = RecordingSession(results={"pg_get_indexdef": self.INDEX_DEFINITIONS})
+
+        definitions = database.db_drop_secondary_indexes(session)
+
+        assert definitions == dict(self.INDEX_DEFINITIONS)
+        assert [statement.split(" (")[0] for statement in session.statements[1:]] == [
+            "INSERT INTO bulk_reload_indexes",
+            "DROP INDEX IF EXISTS idx_category",
+            "INSERT INTO bulk_reload_indexes",
+            "DROP INDEX IF EXISTS idx_timestamp",
+        ]
+
+    def test_create_replays_saved_definitions_concurrently(self):
+        """Test that saved definitions are rebuilt on an AUTOCOMMIT connection, INVALID leftovers first."""
+        session = RecordingSession(
+            results={"FROM bulk_reload_indexes": self.INDEX_DEFINITIONS, "indisvalid": [("idx_timestamp",)]}
+        )
+
+        database.db_create_secondary_indexes(session)
+
+        assert session.execution_options == {"isolation_level": "AUTOCOMMIT"}
+        assert session.statements[2:] == [
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_timestamp",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_category ON public.predictions USING btree (category)",
+            "DELETE FROM bulk_reload_indexes WHERE name = :name",
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_timestamp ON public.transactions USING btree ("timestamp")',
+            "DELETE FROM bulk_reload_indexes WHERE name = :name",
+        ]
+
+    def test_create_is_a_no_op_without_saved_definitions(self):
+        """Test that nothing is built when no reload left definitions behind."""
+        session = RecordingSession()
+
+        database.db_create_secondary_indexes(session)
+
+        assert session.statements == ["SELECT name, definition FROM bulk_reload_indexes ORDER BY name"]
+
+
+class TestGetDbSession:
+    """Test suite for session creation."""
+
+    def test_sessions_share_a_cached_engine(self):
+        """Test that sessions for the same URL reuse one engine and its pool."""
+        with (
+            database.get_db_session("sqlite://") as first,
+            database.get_db_session("sqlite://", bulk_mode=True) as bulk,
+        ):
+            assert first.get_bind() is bulk.get_bind()
+            assert first.autoflush and not bulk.autoflush
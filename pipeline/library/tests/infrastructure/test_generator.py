@@ -0,0 +1,150 @@
+"""
+Tests for transaction loading module.
+
+Reads small local CSV files through the same Polars path used for S3
+objects, so no object storage is needed.
+"""
+
+import polars as pl
+
+from core.model import Transaction
+from infrastructure import generator
+from infrastructure.generator import load_and_validate_transactions, s3_storage_options
+
+HEADER = "id;description;amount;timestamp;merchant;operation_type;side"
+
+
+class TestLoadAndValidateTransactions:
+    """Test suite for loading and validating CSV transactions."""
+
+    def _write_csv(self, tmp_path, rows: list[str]) -> str:
+        """Helper to write a semicolon-separated CSV file."""
+        path = tmp_path / "transactions.csv"
+        path.write_text("\n".join([HEADER, *rows]) + "\n")
+        return str(path)
+
+    def _load(self, path: str, batch_size: int = 100) -> list[tuple[list[dict], list[dict]]]:
+        """Helper to load all batches from a local CSV."""
+        return list(
+            load_and_validate_transactions(
+                path, storage_options={}, run_id="run-1", processing_type="batch", batch_size=batch_size
+            )
+        )
+
+    def test_rows_with_nulls_reported_as_invalid(self, tmp_path):
+        """Test that rows with null values are yielded as invalid instead of dropped."""
+        path = self._write_csv(
+            tmp_path,
+            [
+                "1;Coffee;3,50;2026-01-11 10:00:00;Cafe;debit;customer",
+                "2;Lunch;;2026-01-11 12:00:00;Bistro;debit;customer",
+                "3;Book;12,00;2026-01-11 13:00:00;;debit;customer",
+            ],
+        )
+
+        [(valid, invalid)] = self._load(path)
+
+        assert len(valid) == 1
+        assert valid[0]["amount"] == 3.5
+        assert valid[0]["run_id"] == "run-1"
+        assert sorted(row["id"] for row in invalid) == ["2", "3"]
+
+    def test_batches_follow_batch_size(self, tmp_path):
+        """Test that each slice yields its own valid and invalid lists."""
+        path = self._write_csv(
+            tmp_path,
+            [
+                "1;Coffee;3,50;2026-01-11 10:00:00;Cafe;debit;customer",
+                "2;Lunch;;2026-01-11 12:00:00;Bistro;debit;customer",
+                "3;Book;12,00;2026-01-11 13:00:00;Shop;debit;customer",
+            ],
+        )
+
+        batches = self._load(path, batch_size=2)
+
+        assert [(len(valid), len(invalid)) for valid, invalid in batches] == [(1, 1), (1, 0)]
+
+    def test_unparseable_values_reported_as_invalid(self, tmp_path):
+        """Test that bad amounts and timestamps are rejected by the columnar checks."""
+        path = self._write_csv(
+            tmp_path,
+            [
+                "1;Coffee;3,50;2026-01-11T10:00:00.250000;Cafe;debit;customer",
+                "2;Lunch;abc;2026-01-11 12:00:00;Bistro;debit;customer",
+                "3;Book;12,00;11/01/2026 13:00;Shop;debit;customer",
+                # Transaction rejects more than 6 fractional digits; Polars would truncate them
+                "4;Taxi;20,00;2026-01-11T10:00:00.1234567;Cab;debit;customer",
+            ],
+        )
+
+        [(valid, invalid)] = self._load(path)
+
+        assert [row["timestamp"] for row in valid] == ["2026-01-11T10:00:00.250000"]
+        assert sorted(row["id"] for row in invalid) == ["2", "3", "4"]
+
+    def test_valid_rows_match_pydantic_model_dump(self, tmp_path):
+        """Test that columnar output matches Transaction(**row).model_dump() apart from the UUID."""
+        path = self._write_csv(
+            tmp_path,
+            [
+                "1;Coffee;-3,50;2026-01-11 10:00:00;Cafe;debit;customer",
+                "2;Lunch;12,00;2026-01-11T12:00:00.026490;Bistro;credit;customer",
+            ],
+        )
+
+        [(valid, _)] = self._load(path)
+
+        for row, raw in zip(
+            valid, [("-3.50", "2026-01-11 10:00:00"), ("12.00", "2026-01-11T12:00:00.026490")], strict=True
+        ):
+            expected = Transaction(
+                id="ignored",
+                description=row["description"],
+                amount=raw[0],
+                timestamp=raw[1],
+                merchant=row["merchant"],
+                operation_type=row["operation_type"],
+                side=row["side"],
+                processing_type="batch",
+                run_id="run-1",
+            ).model_dump()
+            assert list(row) == list(expected)
+            assert {k: v for k, v in row.items() if k != "id"} == {k: v for k, v in expected.items() if k != "id"}
+            assert len(row["id"]) == 36
+
+
+class TestS3StorageOptions:
+    """Test suite for the object storage options handed to Polars."""
+
+    def test_reader_receives_flat_object_store_options(self, tmp_path, monkeypatch):
+        """Test that scan_csv gets string-valued object_store keys, not fsspec's nested client_kwargs."""
+        path = tmp_path / "transactions.csv"
+        path.write_text(HEADER + "\n1;Coffee;3,50;2026-01-11 10:00:00;Cafe;debit;customer\n")
+        scan_calls = []
+        real_scan_csv = pl.scan_csv
+
+        def scan_csv(source, **kwargs):
+            # Record the options, then read the local file in place of the bucket
+            scan_calls.append(kwargs["storage_options"])
+            return real_scan_csv(path, **{**kwargs, "storage_options": None})
+
+        monkeypatch.setattr(generator.pl, "scan_csv", scan_csv)
+
+        options = s3_storage_options(key="minio", secret="minio123", endpoint_url="http://minio:9000")
+        list(
+            load_and_validate_transactions("s3://transactions/t.csv", options, run_id="run-1", processing_type="batch")
+        )
+
+        assert scan_calls == [
+            {
+                "aws_access_key_id": "minio",
+                "aws_secret_access_key": "minio123",
+                "aws_endpoint_url": "http://minio:9000",
+                "aws_allow_http": "true",
+                "aws_region": "us-east-1",
+            }
+        ]
+
+    def test_https_endpoints_disallow_plain_http(self):
+        """Test that aws_allow_http follows the endpoint scheme."""
+        assert s3_storage_options("k", "s", "https://s3.example.com")["aws_allow_http"] == "false"
@@ -0,0 +1,81 @@
+"""
+Tests for the retry decorator.
+
+time.sleep is patched so backoff delays are recorded instead of waited.
+"""
+
+import pytest
+import requests
+
+from infrastructure import utils
+from infrastructure.utils import retry_with_backoff
+
+
+def http_error(status_code: int) -> requests.exceptions.HTTPError:
+    """Build the HTTPError raise_for_status() raises for a status code."""
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f"{status_code} error", response=response)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested sleep durations."""
+    recorded = []
+    monkeypatch.setattr(utils.time, "sleep", recorded.append)
+    return recorded
+
+
+class TestRetryWithBackoff:
+    """Test suite for retry_with_backoff."""
+
+    @pytest.mark.parametrize(
+        "exc,expected_calls",
+        [
+            (http_error(503), 3),
+            (http_error(429), 3),
+            (requests.exceptions.ConnectionError("refused"), 3),
+            (http_error(400), 1),
+            (http_error(422), 1),
+        ],
+    )
+    def test_only_retryable_errors_are_retried(self, sleeps, exc, expected_calls):
+        """Test that client errors fail fast while transient errors use every attempt."""
+        calls = []
+
+        @retry_with_backoff(max_retries=3)
+        def call(transactions):
+            calls.append(transactions)
+            raise exc
+
+        assert call(["tx"]) == (["tx"], None)
+        assert len(calls) == expected_calls
+        assert len(sleeps) == expected_calls - 1
+
+    def test_delays_are_jittered_and_capped(self, sleeps):
+        """Test that each sleep is 50-100% of the doubled delay, bounded by max_delay."""
+
+        @retry_with_backoff(max_retries=6, initial_delay=1.0, max_delay=4.0)
+        def call(transactions):
+            raise http_error(503)
+
+        call([])
+
+        for sleep_seconds, delay in zip(sleeps, [1.0, 2.0, 4.0, 4.0, 4.0], strict=True):
+            assert delay * 0.5 <= sleep_seconds <= delay
+
+    def test_max_retries_read_from_environment_per_call(self, sleeps, monkeypatch):
+        """Test that MAX_RETRIES is honoured at call time when max_retries is not given."""
+        calls = []
+
+        @retry_with_backoff()
+        def call(transactions):
+            calls.append(transactions)
+            raise http_error(503)
+
+        monkeypatch.setenv("MAX_RETRIES", "2")
+        call([])
+        monkeypatch.setenv("MAX_RETRIES", "4")
+        call([])
+
+        assert len(calls) == 6